@@ -1,38 +1,17 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.core.security import verify_token
-from app.crud.user import user_crud
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
 from app.models.user import User
 
-security = HTTPBearer()
+# Token parsing happens once in AuthMiddleware; this scheme only documents bearer auth in OpenAPI
+security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
-        credentials: HTTPAuthorizationCredentials = Depends(security),
-        db: AsyncSession = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-
-    email: str = payload.get("sub")
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-
-    user = await user_crud.get_by_email(db, email=email)
+async def get_current_user(request: Request, _=Depends(security)) -> User:
+    user = request.state.user
     if user is None:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
+            status_code=request.state.auth_status_code,
+            detail=request.state.auth_error
         )
     return user
 
@@ -44,28 +23,3 @@ async def get_current_active_admin(current_user: User = Depends(get_current_user
             detail="Not enough permissions"
         )
     return current_user
-
-
-async def get_user_updater_permission(
-        user_id: int,
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
-) -> User:
-    """
-    Permission rules for PATCH /users/{id}:
-    - If user_id == current_user.id → User permission (cannot change role)
-    - If user_id != current_user.id → Admin permission required
-    """
-    target_user = await user_crud.get_by_id(db, user_id)
-    if not target_user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if target_user.id == current_user.id:
-        return current_user
-    else:
-        if current_user.role != "admin":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only admin can update other users"
-            )
-        return current_user
@@ -0,0 +1,76 @@
+import hashlib
+import logging
+import time
+from typing import Optional, Tuple
+
+from cachetools import TTLCache
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.database import AsyncSessionLocal
+from app.core.security import verify_token
+from app.crud.user import user_crud
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Decoded JWT payloads keyed by SHA-256 of the raw token.
+# Only successful verifications are stored; entries never outlive the token's "exp".
+_payload_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+
+def _get_token_payload(token: str) -> Optional[dict]:
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _payload_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        _payload_cache.pop(key, None)
+
+    payload = verify_token(token)
+    if payload and payload.get("exp", 0) > time.time():
+        _payload_cache[key] = payload
+    return payload
+
+
+async def _authenticate(authorization: Optional[str]) -> Tuple[Optional[User], str]:
+    """Resolve an Authorization header to (user, error detail)."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None, "Not authenticated"
+
+    payload = _get_token_payload(token)
+    if not payload or payload.get("sub") is None:
+        return None, "Invalid authentication credentials"
+
+    async with AsyncSessionLocal() as db:
+        user = await user_crud.get_by_email_auth(db, email=payload["sub"])
+    if user is None:
+        return None, "User not found"
+    return user, ""
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware that resolves the bearer token to a user once per request.
+    Stores request.state.user (None if unauthenticated), request.state.auth_error and
+    request.state.auth_status_code. Lookup failures (e.g. database down) are recorded
+    instead of raised, so public routes are unaffected; only get_current_user reports them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            status_code = 401
+            try:
+                user, error = await _authenticate(Headers(scope=scope).get("authorization"))
+            except Exception:
+                logger.exception("User lookup failed while authenticating request")
+                user, error, status_code = None, "Authentication service unavailable", 503
+            state = scope.setdefault("state", {})
+            state["user"] = user
+            state["auth_error"] = error
+            state["auth_status_code"] = status_code
+        await self.app(scope, receive, send)
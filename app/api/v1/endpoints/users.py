@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from app.core.database import get_db
-from app.api.deps import get_current_user, get_current_active_admin, get_user_updater_permission
+from app.api.deps import get_current_user, get_current_active_admin
 from app.crud.user import user_crud
 from app.models.user import User
-from app.schemas.user import UserOut, UserUpdate
-from typing import List
+from app.schemas.user import UserOut, UserPage, UserUpdate
+from typing import Optional
 
 router = APIRouter()
 
@@ -16,19 +16,24 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 
-@router.get("/users", summary="Get all users (Admin only)")
+@router.get("/users", summary="Get all users (Admin only)", response_model=UserPage)
 async def read_users(
-        skip: int = 0,
-        limit: int = 100,
+        after_id: Optional[int] = None,
+        limit: int = Query(100, ge=1, le=100),
         db: AsyncSession = Depends(get_db),
         current_user: User = Depends(get_current_active_admin)
-) -> List[UserOut]:
-    """Get all users (Admin only)"""
-    result = await db.execute(
-        select(User).offset(skip).limit(limit)
-    )
+):
+    """
+    Get all users (Admin only).
+    Keyset pagination: pass the previous page's next_cursor as after_id.
+    """
+    stmt = select(User).order_by(User.id).limit(limit)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    result = await db.execute(stmt)
     users = result.scalars().all()
-    return users
+    next_cursor = users[-1].id if users and len(users) == limit else None
+    return {"items": users, "next_cursor": next_cursor}
 
 
 @router.get("/users/{user_id}", summary="Get user by ID (Admin only)", response_model=UserOut)
@@ -44,38 +49,28 @@ async def read_user(
     return user
 
 
-@router.patch("/users/{user_id}", summary="Update user (Self or Admin)")
+@router.patch("/users/{user_id}", summary="Update user (Self or Admin)", response_model=UserOut)
 async def update_user(
         user_id: int,
         user_update: UserUpdate,
         db: AsyncSession = Depends(get_db),
-        updater: User = Depends(get_user_updater_permission)
-) -> UserOut:
+        current_user: User = Depends(get_current_user)
+):
     """
     Update user logic:
     - Self: full_name only
     - Admin: full_name + role
     """
-    target_user = await user_crud.get_by_id(db, user_id)
-    if not target_user:
-        raise HTTPException(status_code=404, detail="User not found")
+    update_data = user_update.model_dump(exclude_unset=True)
 
-    update_data = user_update.dict(exclude_unset=True)
-
-    if target_user.id == updater.id:
-        if "role" in update_data:
-            raise HTTPException(
-                status_code=403,
-                detail="Cannot change own role"
-            )
-        if "full_name" in update_data:
-            target_user.full_name = update_data["full_name"]
-    else:
-        for field, value in update_data.items():
-            setattr(target_user, field, value)
+    try:
+        target_user = await user_crud.update_user_tx(db, user_id, current_user.email, update_data)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="User not found")
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
 
-    await db.commit()
-    await db.refresh(target_user)
+    # Row came from UPDATE ... RETURNING and expire_on_commit=False keeps it loaded; no refresh needed
     return target_user
 
 
@@ -86,10 +81,13 @@ async def delete_user(
         current_user: User = Depends(get_current_active_admin)
 ):
     """Delete user (Admin only)"""
-    user = await user_crud.get_by_id(db, user_id)
-    if not user:
+    result = await db.execute(
+        delete(User).where(User.id == user_id).returning(User.email)
+    )
+    email = result.scalar_one_or_none()
+    if email is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    await db.delete(user)
     await db.commit()
+    user_crud.invalidate(email)
     return {"message": "User deleted successfully"}
@@ -1,11 +1,31 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from app.core.config import settings
 from app.models.user import Base
 
+engine_kwargs = {}
+if make_url(settings.DATABASE_URL).get_driver_name() == "asyncpg":
+    # QueuePool sizing (aiosqlite file databases use NullPool, which rejects these)
+    engine_kwargs = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # Disable server-side JIT (stalls on short queries) and keep the prepared-statement cache hot
+        "connect_args": {"server_settings": {"jit": "off"}, "prepared_statement_cache_size": 1024},
+    }
+
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,
-    future=True
+    echo=settings.DB_ECHO,
+    echo_pool=False,
+    future=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    **engine_kwargs
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -29,10 +49,31 @@ async def get_db() -> AsyncSession:
 async def create_tables():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add the case-insensitive email index explicitly
+        await conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email))"
+        ))
+
+
+async def _ping():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_pool():
+    """Open pool_size connections concurrently so first requests don't pay connect cost."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        # e.g. NullPool for aiosqlite: connections are not kept, so warming is pointless
+        return
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(pool.size()):
+            tg.create_task(_ping())
 
 
 async def startup():
     await create_tables()
+    await warm_pool()
 
 
 async def shutdown():
@@ -1,41 +1,84 @@
-import random
-import string
+import asyncio
+import secrets
 from typing import Optional
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only, make_transient_to_detached
 
-from app.core.security import get_password_hash, verify_password
-from app.models.user import User
+from app.core.security import get_password_hash, verify_and_update_password
+from app.models.user import User, UserRole
 from app.schemas.user import UserCreate
 
 
+# Process-local cache of detached User snapshots for the per-request auth path, keyed by email.
+# Entries are re-attached to the caller's session via merge(load=False), so a hit costs no SELECT.
+_auth_user_cache: TTLCache[str, User] = TTLCache(maxsize=5000, ttl=60)
+
+# Columns needed to authorize a request and render UserOut; secrets and timestamps stay unloaded
+AUTH_COLUMNS = (User.id, User.email, User.full_name, User.role, User.is_verified)
+
+
+def _detached_copy(user: User) -> User:
+    snapshot = User(**{column.key: getattr(user, column.key) for column in AUTH_COLUMNS})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
 class CRUDUser:
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
-        result = await db.execute(select(User).where(User.email == email))
+        result = await db.execute(select(User).where(func.lower(User.email) == email.lower()))
         return result.scalar_one_or_none()
 
+    async def get_by_email_auth(self, db: AsyncSession, email: str) -> Optional[User]:
+        """Narrow lookup for the per-request auth path; only AUTH_COLUMNS are loaded."""
+        email = email.lower()
+        cached = _auth_user_cache.get(email)
+        if cached is not None:
+            return await db.merge(cached, load=False)
+
+        result = await db.execute(
+            select(User).options(load_only(*AUTH_COLUMNS)).where(func.lower(User.email) == email)
+        )
+        user = result.scalar_one_or_none()
+        if user is not None:
+            _auth_user_cache[email] = _detached_copy(user)
+        return user
+
+    def invalidate(self, email: str) -> None:
+        _auth_user_cache.pop(email.lower(), None)
+
     async def get_by_id(self, db: AsyncSession, user_id: int) -> Optional[User]:
         result = await db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
     async def create(self, db: AsyncSession, user_in: UserCreate) -> User:
+        verification_code = f"{secrets.randbelow(1_000_000):06d}"
+        # Password hashing is CPU-bound; run it off the event loop
+        hashed_password = await asyncio.to_thread(get_password_hash, user_in.password)
 
-        existing_user = await self.get_by_email(db, user_in.email)
-        if existing_user:
-            raise ValueError("Email already registered")
-
-        verification_code = ''.join(random.choices(string.digits, k=6))
-
-        user = User(
-            email=user_in.email,
-            full_name=user_in.full_name,
-            hashed_password=get_password_hash(user_in.password),
-            verification_code=verification_code,
-            is_verified=False
+        # Single INSERT ... ON CONFLICT DO NOTHING RETURNING instead of SELECT + INSERT
+        insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+        stmt = (
+            insert(User)
+            .values(
+                email=user_in.email,
+                full_name=user_in.full_name,
+                hashed_password=hashed_password,
+                verification_code=verification_code,
+                is_verified=False
+            )
+            # No conflict target: either the email or the lower(email) unique index may fire
+            .on_conflict_do_nothing()
+            .returning(User)
         )
-        db.add(user)
-        await db.flush()
+        result = await db.execute(stmt)
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise ValueError("Email already registered")
         return user
 
     async def verify(self, db: AsyncSession, email: str, code: str) -> bool:
@@ -46,13 +89,73 @@ class CRUDUser:
         user.is_verified = True
         user.verification_code = None
         await db.commit()
+        self.invalidate(email)
         return True
 
-    async def authenticate(self, db: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await self.get_by_email(db, email)
-        if not user or not verify_password(password, user.hashed_password):
+    async def authenticate(self, db: AsyncSession, email: str, password: str) -> Optional[Row]:
+        """Return a (id, email, hashed_password, role) row on success; no ORM instance is hydrated."""
+        result = await db.execute(
+            select(User.id, User.email, User.hashed_password, User.role)
+            .where(func.lower(User.email) == email.lower())
+        )
+        user = result.one_or_none()
+        if user is None:
             return None
+
+        # Password hashing is CPU-bound; run it off the event loop
+        verified, new_hash = await asyncio.to_thread(
+            verify_and_update_password, password, user.hashed_password
+        )
+        if not verified:
+            return None
+
+        if new_hash:
+            # Lazily migrate legacy (bcrypt) hashes to argon2id
+            await db.execute(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+            await db.commit()
+            self.invalidate(user.email)
         return user
 
+    async def update_user_tx(
+            self, db: AsyncSession, user_id: int, updater_email: str, update_data: dict
+    ) -> User:
+        """
+        Load updater and target in one SELECT (updater LEFT JOIN target), authorize,
+        then UPDATE ... RETURNING and commit.
+        Raises LookupError if the target is missing and PermissionError if the updater
+        no longer exists or the update is not allowed.
+        """
+        target, updater = aliased(User), aliased(User)
+        result = await db.execute(
+            select(updater.id, updater.role, target)
+            .select_from(updater)
+            .outerjoin(target, target.id == user_id)
+            .where(func.lower(updater.email) == updater_email.lower())
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise PermissionError("Updater not found")
+        updater_id, updater_role, target_user = row
+        if target_user is None:
+            raise LookupError("User not found")
+
+        if target_user.id == updater_id:
+            if "role" in update_data:
+                raise PermissionError("Cannot change own role")
+        elif updater_role != UserRole.ADMIN:
+            raise PermissionError("Only admin can update other users")
+
+        if update_data:
+            result = await db.execute(
+                update(User).where(User.id == user_id).values(**update_data).returning(User)
+            )
+            target_user = result.scalar_one_or_none()
+            if target_user is None:
+                raise LookupError("User not found")
+
+        await db.commit()
+        self.invalidate(target_user.email)
+        return target_user
+
 
 user_crud = CRUDUser()
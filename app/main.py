@@ -2,7 +2,10 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.api.middleware import AuthMiddleware
 from app.api.v1 import endpoints
 from app.core.database import startup, shutdown
 
@@ -20,9 +23,13 @@ app = FastAPI(
     title="Coffee Shop API - User Management",
     description="JWT auth, verification, and roles system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Resolves the bearer token to request.state.user once per request (innermost middleware)
+app.add_middleware(AuthMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +39,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression (added last so it wraps CORS and compresses the final response)
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 app.include_router(endpoints.auth.router, prefix="/auth", tags=["auth"])
 app.include_router(endpoints.users.router, tags=["users"])
 
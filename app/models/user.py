@@ -1,6 +1,6 @@
 from enum import Enum
 
-from sqlalchemy import Column, Integer, DateTime, String, Enum as SQLEnum, Boolean
+from sqlalchemy import Column, Integer, DateTime, String, Enum as SQLEnum, Boolean, Index
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.sql import func
@@ -26,3 +26,8 @@ class User(Base):
     verification_code = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     # Note: created_at is used for automatic cleanup logic (unverified users after 2 days)
+
+    __table_args__ = (
+        # Case-insensitive email lookups (func.lower(User.email) == ...) use this index
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+    )
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from app.models.user import UserRole
 
@@ -15,12 +15,16 @@ class UserCreate(UserBase):
 
 
 class UserOut(UserBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     role: UserRole
     is_verified: bool
 
-    class Config:
-        from_attributes = True
+
+class UserPage(BaseModel):
+    items: List[UserOut]
+    next_cursor: Optional[int] = None
 
 
 class UserUpdate(BaseModel):